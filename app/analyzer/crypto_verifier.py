@@ -6,29 +6,38 @@ y comparándola con la firma adjunta en el token.
 """
 
 import json
-import base64
+import re
 import hmac
 import hashlib
-from typing import Dict, Any
+from typing import Any, Dict, List
+from app.analyzer.decoder_json import decode_base64url, decode_base64url_bytes
+from app.analyzer.encoder import _b64url_nopad
 
+# Sondear una vez el backend HMAC de OpenSSL (EVP, con despacho a SHA-NI
+# cuando el CPU lo soporta) y cachear la función más rápida disponible.
+try:
+    import _hashlib
+    _hmac_digest = _hashlib.hmac_digest
+except (ImportError, AttributeError):
+    _hmac_digest = hmac.digest
 
-def decode_base64url(encoded_string: str) -> str:
-    """
-    Decodifica un string Base64URL a UTF-8.
-    
-    Se aplica para convertir tokens Base64URL del JWT a strings JSON legibles.
-    """
-    base64_string = encoded_string.replace('-', '+').replace('_', '/')
-    
-    padding_length = 4 - (len(base64_string) % 4)
-    if padding_length != 4:
-        base64_string += '=' * padding_length
-    
-    try:
-        decoded_bytes = base64.urlsafe_b64decode(base64_string)
-        return decoded_bytes.decode('utf-8')
-    except (base64.binascii.Error, UnicodeDecodeError) as e:
-        raise ValueError(f"Error de decodificación Base64URL: {e}")
+
+# Plantillas de error con mensaje fijo, construidas una sola vez: en
+# tráfico adversarial la mayoría de tokens son inválidos y crear el mismo
+# dict por verificación es puro costo de asignación. No mutar.
+_ERR_BAD_FORMAT = {
+    'valid': False,
+    'error': 'Formato de JWT inválido: debe tener 3 partes separadas por puntos'
+}
+_ERR_MISSING_ALG = {
+    'valid': False,
+    'error': 'El header no contiene el claim "alg"'
+}
+
+# Extrae el algoritmo del header sin parsear todo el JSON: en input
+# adversarial con headers gigantes, el parse completo se difiere hasta
+# después de la verificación de firma
+_ALG_RE = re.compile(rb'"alg"\s*:\s*"(HS256|HS384)"')
 
 
 def sign_token(header_b64: str, payload_b64: str, algorithm: str, secret: str) -> str:
@@ -38,84 +47,74 @@ def sign_token(header_b64: str, payload_b64: str, algorithm: str, secret: str) -
     Recibe header y payload codificados en Base64URL, el algoritmo (HS256 o HS384)
     y la clave secreta. Retorna la firma codificada en Base64URL.
     """
-    message = f"{header_b64}.{payload_b64}"
-    
     if algorithm == "HS256":
-        hash_algorithm = hashlib.sha256
+        hash_name = 'sha256'
     elif algorithm == "HS384":
-        hash_algorithm = hashlib.sha384
+        hash_name = 'sha384'
     else:
         raise ValueError(f"Algoritmo no soportado: {algorithm}. Solo se soportan HS256 y HS384.")
-    
-    signature_bytes = hmac.new(
+
+    # Un solo join en C sobre bytes: sin f-string intermedio ni re-encode
+    # UTF-8 del mensaje (las partes Base64URL son ASCII puro).
+    # Llamada única a nivel C, sin construir el objeto HMAC de Python.
+    signature_bytes = _hmac_digest(
         secret.encode('utf-8'),
-        message.encode('utf-8'),
-        hash_algorithm
-    ).digest()
-    
-    signature_b64 = base64.urlsafe_b64encode(signature_bytes).decode('utf-8')
-    return signature_b64.rstrip('=')
+        b'.'.join((header_b64.encode('ascii'), payload_b64.encode('ascii'))),
+        hash_name
+    )
 
+    return _b64url_nopad(signature_bytes)
 
-def verify_jwt_signature(jwt_token: str, secret: str) -> Dict[str, Any]:
+
+def _verify_with_signer(jwt_token: str, signer) -> Dict[str, Any]:
     """
-    Verifica la integridad criptográfica de un JWT.
-    
-    Recalcula la firma digital basándose en el contenido del header y payload
-    y la compara con la firma adjunta en el token.
-    
-    Args:
-        jwt_token: String con el JWT completo en formato header.payload.signature
-        secret: Clave secreta para recalcular la firma
-    
-    Returns:
-        Diccionario con:
-            - valid: bool indicando si la verificación fue exitosa
-            - algorithm: algoritmo usado (HS256 o HS384)
-            - header: diccionario con el header decodificado
-            - payload: diccionario con el payload decodificado
-            - error: mensaje de error si la verificación falló
+    Flujo de verificación común: separa el token, valida el header y
+    compara la firma calculada por `signer(header_b64, payload_b64, alg)`.
     """
     try:
         # Separar el JWT en sus componentes
         parts = jwt_token.split('.')
         
         if len(parts) != 3:
-            return {
-                'valid': False,
-                'error': 'Formato de JWT inválido: debe tener 3 partes separadas por puntos'
-            }
+            return _ERR_BAD_FORMAT
         
         header_b64, payload_b64, signature_b64 = parts
-        
-        # Decodificar el header para obtener el algoritmo
+
+        # Decodificar el header y extraer solo 'alg' con la regex; el
+        # parse JSON completo se difiere hasta que el resultado lo necesite
         try:
-            header_json = decode_base64url(header_b64)
-            header = json.loads(header_json)
-        except (ValueError, json.JSONDecodeError) as e:
+            header_bytes = decode_base64url_bytes(header_b64)
+        except ValueError as e:
             return {
                 'valid': False,
                 'error': f'Error al decodificar el header: {e}'
             }
-        
-        # Validar que el header tenga el algoritmo
-        if 'alg' not in header:
-            return {
-                'valid': False,
-                'error': 'El header no contiene el claim "alg"'
-            }
-        
-        algorithm = header['alg']
-        
-        if algorithm not in ["HS256", "HS384"]:
+
+        match = _ALG_RE.search(header_bytes)
+        if match is None:
+            # Sin algoritmo soportado a la vista: parsear para distinguir
+            # entre header ilegible, 'alg' faltante o alg no soportado
+            try:
+                header = json.loads(header_bytes)
+            except (ValueError, json.JSONDecodeError) as e:
+                return {
+                    'valid': False,
+                    'error': f'Error al decodificar el header: {e}'
+                }
+
+            if not isinstance(header, dict) or 'alg' not in header:
+                return _ERR_MISSING_ALG
+
             return {
                 'valid': False,
-                'error': f'Algoritmo no soportado: {algorithm}. Solo se soportan HS256 y HS384.'
+                'error': f'Algoritmo no soportado: {header["alg"]}. Solo se soportan HS256 y HS384.'
             }
-        
+
+        algorithm = match.group(1).decode('ascii')
+
         # Recalcular la firma
         try:
-            recalculated_signature = sign_token(header_b64, payload_b64, algorithm, secret)
+            recalculated_signature = signer(header_b64, payload_b64, algorithm)
         except ValueError as e:
             return {
                 'valid': False,
@@ -129,15 +128,21 @@ def verify_jwt_signature(jwt_token: str, secret: str) -> Dict[str, Any]:
         
         # Usar comparación segura de strings
         if not hmac.compare_digest(signature_normalized, recalculated_normalized):
+            # Recién aquí hace falta el header completo para la respuesta
+            try:
+                header = json.loads(header_bytes)
+            except (ValueError, json.JSONDecodeError):
+                header = None
             return {
                 'valid': False,
                 'algorithm': algorithm,
                 'header': header,
                 'error': 'La firma no coincide. El token puede haber sido alterado o la clave secreta es incorrecta.'
             }
-        
-        # Decodificar el payload para incluirlo en la respuesta
+
+        # Firma válida: parsear header y payload para la respuesta
         try:
+            header = json.loads(header_bytes)
             payload_json = decode_base64url(payload_b64)
             payload = json.loads(payload_json)
         except (ValueError, json.JSONDecodeError) as e:
@@ -145,7 +150,7 @@ def verify_jwt_signature(jwt_token: str, secret: str) -> Dict[str, Any]:
                 'valid': False,
                 'error': f'Error al decodificar el payload: {e}'
             }
-        
+
         return {
             'valid': True,
             'algorithm': algorithm,
@@ -159,3 +164,83 @@ def verify_jwt_signature(jwt_token: str, secret: str) -> Dict[str, Any]:
             'error': f'Error inesperado durante la verificación: {e}'
         }
 
+
+def verify_jwt_signature(jwt_token: str, secret: str) -> Dict[str, Any]:
+    """
+    Verifica la integridad criptográfica de un JWT.
+
+    Recalcula la firma digital basándose en el contenido del header y payload
+    y la compara con la firma adjunta en el token.
+
+    Args:
+        jwt_token: String con el JWT completo en formato header.payload.signature
+        secret: Clave secreta para recalcular la firma
+
+    Returns:
+        Diccionario con:
+            - valid: bool indicando si la verificación fue exitosa
+            - algorithm: algoritmo usado (HS256 o HS384)
+            - header: diccionario con el header decodificado
+            - payload: diccionario con el payload decodificado
+            - error: mensaje de error si la verificación falló
+    """
+    return _verify_with_signer(
+        jwt_token,
+        lambda header_b64, payload_b64, algorithm: sign_token(
+            header_b64, payload_b64, algorithm, secret
+        )
+    )
+
+
+# (constructor de hash, tamaño de bloque HMAC) por algoritmo soportado
+_HASH_BY_ALG = {
+    'HS256': (hashlib.sha256, 64),
+    'HS384': (hashlib.sha384, 128),
+}
+
+
+def _precompute_hmac_contexts(secret: str, algorithm: str):
+    """
+    Precalcula los contextos HMAC interno/externo (bloques ipad/opad)
+    para una clave y algoritmo dados. Los contextos se clonan con
+    .copy() por mensaje, ahorrando la compresión del bloque de clave.
+    """
+    hash_ctor, block_size = _HASH_BY_ALG[algorithm]
+    key = secret.encode('utf-8')
+    if len(key) > block_size:
+        key = hash_ctor(key).digest()
+    key = key.ljust(block_size, b'\x00')
+    inner = hash_ctor(bytes(b ^ 0x36 for b in key))
+    outer = hash_ctor(bytes(b ^ 0x5C for b in key))
+    return inner, outer
+
+
+def verify_jwt_signatures_batch(jwt_tokens: List[str], secret: str) -> List[Dict[str, Any]]:
+    """
+    Verifica varios JWT que comparten la misma clave secreta.
+
+    El key schedule de HMAC (los bloques derivados de la clave) se calcula
+    una sola vez por algoritmo y se clona el contexto SHA por token con
+    .copy() (una llamada en C), ahorrando una compresión de bloque por
+    token frente a llamar verify_jwt_signature en un bucle.
+
+    Retorna una lista de resultados en el mismo orden que jwt_tokens,
+    cada uno con el formato de verify_jwt_signature.
+    """
+    contexts = {}
+
+    def signer(header_b64, payload_b64, algorithm):
+        ctx = contexts.get(algorithm)
+        if ctx is None:
+            ctx = contexts[algorithm] = _precompute_hmac_contexts(secret, algorithm)
+        inner, outer = ctx
+        h = inner.copy()
+        h.update(header_b64.encode('ascii'))
+        h.update(b'.')
+        h.update(payload_b64.encode('ascii'))
+        h_out = outer.copy()
+        h_out.update(h.digest())
+        return _b64url_nopad(h_out.digest())
+
+    return [_verify_with_signer(token, signer) for token in jwt_tokens]
+
@@ -8,23 +8,33 @@ Se aplica después del análisis léxico (Fase 1) y antes del análisis sintáct
 import base64
 from typing import Dict, List, Any
 
+# Tabla de traducción precompilada: un solo pase translate() en vez de
+# dos pases replace() a nivel Python
+_B64URL_TABLE = bytes.maketrans(b'-_', b'+/')
+
+
+def decode_base64url_bytes(encoded_string: str) -> bytes:
+    """
+    Decodifica un string Base64URL a bytes crudos (sin decodificar UTF-8).
+    """
+    try:
+        base64_bytes = encoded_string.encode('ascii').translate(_B64URL_TABLE)
+        # Padding calculado sin condicional: (-len) & 3 da 0..3 '='
+        base64_bytes += b'=' * (-len(base64_bytes) & 3)
+        return base64.b64decode(base64_bytes)
+    except (base64.binascii.Error, UnicodeError) as e:
+        raise ValueError(f"Error de decodificación Base64URL: {e}")
+
 
 def decode_base64url(encoded_string: str) -> str:
     """
     Decodifica un string Base64URL a UTF-8.
-    
+
     Se aplica para convertir tokens Base64URL del JWT a strings JSON legibles.
     """
-    base64_string = encoded_string.replace('-', '+').replace('_', '/')
-    
-    padding_length = 4 - (len(base64_string) % 4)
-    if padding_length != 4:
-        base64_string += '=' * padding_length
-    
     try:
-        decoded_bytes = base64.urlsafe_b64decode(base64_string)
-        return decoded_bytes.decode('utf-8')
-    except (base64.binascii.Error, UnicodeDecodeError) as e:
+        return decode_base64url_bytes(encoded_string).decode('utf-8')
+    except UnicodeDecodeError as e:
         raise ValueError(f"Error de decodificación Base64URL: {e}")
 
 
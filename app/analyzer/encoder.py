@@ -8,49 +8,113 @@ Valida la estructura sintáctica y semántica del header y payload antes de codi
 import json
 import base64
 import hmac
-import hashlib
+from functools import lru_cache
 from typing import Dict, Any
 from app.analyzer.syntactic_analyzer import analyze_syntax
-from app.analyzer.semantic_analyzer import SemanticAnalyzer
+from app.analyzer.semantic_analyzer import DEFAULT_SEMANTIC_ANALYZER
+
+# orjson (Rust, SIMD) serializa 3-5x más rápido que json y ya emite bytes
+# compactos, evitando además el .encode('utf-8') antes del Base64; si no
+# está instalado se usa json.dumps sin cambio de comportamiento
+try:
+    import orjson
+
+    def _json_dumps_bytes(obj) -> bytes:
+        return orjson.dumps(obj)
+except ImportError:
+    def _json_dumps_bytes(obj) -> bytes:
+        return json.dumps(obj, separators=(',', ':')).encode('utf-8')
+
+
+# Sondear una vez el backend HMAC de OpenSSL (EVP, con despacho a SHA-NI
+# cuando el CPU lo soporta) y cachear la función más rápida disponible.
+try:
+    import _hashlib
+    _hmac_digest = _hashlib.hmac_digest
+except (ImportError, AttributeError):
+    _hmac_digest = hmac.digest
+
+
+# Tabla inversa a la de decodificación: urlsafe_b64encode es un wrapper
+# Python sobre b64encode + translate; llamar las piezas directamente
+# ahorra un frame por codificación
+_ENC_TABLE = bytes.maketrans(b'+/', b'-_')
+
+
+def _b64url_nopad_bytes(data: bytes) -> bytes:
+    """Codifica bytes a Base64URL sin padding, devolviendo bytes."""
+    return base64.b64encode(data).translate(_ENC_TABLE).rstrip(b'=')
+
+
+def _b64url_nopad(data: bytes) -> str:
+    """
+    Codifica bytes a Base64URL sin padding, en una sola pasada.
+
+    rstrip sobre bytes evita decodificar el padding y .decode('ascii')
+    omite la validación UTF-8 (la salida Base64 siempre es ASCII).
+    """
+    return _b64url_nopad_bytes(data).decode('ascii')
 
 
 def encode_base64url(data: str) -> str:
     """
     Codifica un string UTF-8 a Base64URL.
-    
+
     Se aplica para convertir strings JSON a formato Base64URL usado en JWT.
     """
-    encoded_bytes = data.encode('utf-8')
-    base64_bytes = base64.urlsafe_b64encode(encoded_bytes)
-    base64_string = base64_bytes.decode('utf-8')
-    # Remover padding '=' según especificación Base64URL
-    return base64_string.rstrip('=')
+    return _b64url_nopad(data.encode('utf-8'))
 
 
-def sign_token(header_b64: str, payload_b64: str, algorithm: str, secret: str) -> str:
+def _sign_token_raw(header_b64: bytes, payload_b64: bytes, algorithm: str, secret: str) -> bytes:
     """
-    Firma un token JWT usando HMAC con el algoritmo especificado.
-    
-    Recibe header y payload codificados en Base64URL, el algoritmo (HS256 o HS384)
-    y la clave secreta. Retorna la firma codificada en Base64URL.
+    Firma las partes ya codificadas (como bytes) y retorna la firma
+    Base64URL en bytes.
+
+    Trabajar en bytes evita el f-string intermedio y su re-encode UTF-8:
+    un solo join en C y directo al HMAC.
     """
-    message = f"{header_b64}.{payload_b64}"
-    
     if algorithm == "HS256":
-        hash_algorithm = hashlib.sha256
+        hash_name = 'sha256'
     elif algorithm == "HS384":
-        hash_algorithm = hashlib.sha384
+        hash_name = 'sha384'
     else:
         raise ValueError(f"Algoritmo no soportado: {algorithm}. Solo se soportan HS256 y HS384.")
-    
-    signature_bytes = hmac.new(
+
+    # Llamada única a nivel C, sin construir el objeto HMAC de Python
+    signature_bytes = _hmac_digest(
         secret.encode('utf-8'),
-        message.encode('utf-8'),
-        hash_algorithm
-    ).digest()
-    
-    signature_b64 = base64.urlsafe_b64encode(signature_bytes).decode('utf-8')
-    return signature_b64.rstrip('=')
+        b'.'.join((header_b64, payload_b64)),
+        hash_name
+    )
+
+    return _b64url_nopad_bytes(signature_bytes)
+
+
+def sign_token(header_b64: str, payload_b64: str, algorithm: str, secret: str) -> str:
+    """
+    Firma un token JWT usando HMAC con el algoritmo especificado.
+
+    Recibe header y payload codificados en Base64URL, el algoritmo (HS256 o HS384)
+    y la clave secreta. Retorna la firma codificada en Base64URL.
+    """
+    return _sign_token_raw(
+        header_b64.encode('ascii'),
+        payload_b64.encode('ascii'),
+        algorithm,
+        secret
+    ).decode('ascii')
+
+
+@lru_cache(maxsize=64)
+def _encode_header_cached(header_items: tuple) -> bytes:
+    """
+    Serializa y codifica un header a partir de sus items ordenados.
+
+    El header JWT suele ser idéntico entre tokens ({"alg": ..., "typ": ...}),
+    por lo que se memoiza el Base64URL para evitar repetir la serialización
+    y codificación en cada llamada a encode_jwt.
+    """
+    return _b64url_nopad_bytes(_json_dumps_bytes(dict(header_items)))
 
 
 def encode_jwt(header: Dict[str, Any], payload: Dict[str, Any], secret: str = "secret") -> str:
@@ -76,30 +140,31 @@ def encode_jwt(header: Dict[str, Any], payload: Dict[str, Any], secret: str = "s
         ExpirationDateError: Si el token está expirado
         NotActiveTokenError: Si el token aún no es válido (nbf)
     """
-    # Serializar a JSON para validación sintáctica
-    header_json = json.dumps(header, separators=(',', ':'))
-    payload_json = json.dumps(payload, separators=(',', ':'))
-    
-    # Validar sintaxis
-    syntax_result = analyze_syntax(header_json, payload_json)
+    # Validar sintaxis directamente sobre los diccionarios: evita el ciclo
+    # serializar→parsear→re-serializar por token
+    syntax_result = analyze_syntax(header, payload)
     if not syntax_result['valid']:
         errors = '; '.join(syntax_result['errors'])
         raise ValueError(f"Validación sintáctica fallida: {errors}")
-    
-    # Validar semántica
-    semantic_analyzer = SemanticAnalyzer()
-    semantic_analyzer.analyze(header, payload)
-    
+
+    # Validar semántica (instancia compartida: el analizador es sin estado)
+    DEFAULT_SEMANTIC_ANALYZER.analyze(header, payload)
+
     # Obtener algoritmo
     algorithm = header['alg']
-    
-    # Codificar a Base64URL
-    header_b64 = encode_base64url(header_json)
-    payload_b64 = encode_base64url(payload_json)
-    
+
+    # Serializar y codificar a Base64URL una sola vez, en bytes de punta a
+    # punta; el header se memoiza porque casi siempre es idéntico entre
+    # tokens (valores no hashables caen a la ruta sin caché)
+    try:
+        header_b64 = _encode_header_cached(tuple(sorted(header.items())))
+    except TypeError:
+        header_b64 = _b64url_nopad_bytes(_json_dumps_bytes(header))
+    payload_b64 = _b64url_nopad_bytes(_json_dumps_bytes(payload))
+
     # Firmar el token
-    signature_b64 = sign_token(header_b64, payload_b64, algorithm, secret)
-    
-    # Construir el JWT completo
-    return f"{header_b64}.{payload_b64}.{signature_b64}"
+    signature_b64 = _sign_token_raw(header_b64, payload_b64, algorithm, secret)
+
+    # Construir el JWT completo (un solo join en C y un decode ASCII)
+    return b'.'.join((header_b64, payload_b64, signature_b64)).decode('ascii')
 
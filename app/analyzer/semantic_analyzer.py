@@ -25,8 +25,21 @@ class NotActiveTokenError(SemanticError):
     pass
 
 class SemanticAnalyzer:
-    def __init__(self):
-        self.supported_algorithms = {"HS256", "HS384"}
+    # Conjunto a nivel de clase: una sola asignación para todas las
+    # instancias (frozenset, inmutable)
+    SUPPORTED_ALGORITHMS = frozenset({"HS256", "HS384"})
+
+    # Tabla de despacho claim -> (tipo esperado, mensaje): un solo bucle
+    # sobre la tabla en vez de una cadena de isinstance por claim.
+    # Se usa type(x) is T (no hay subclases válidas aquí; también excluye
+    # bool, que es subclase de int pero no es un NumericDate válido).
+    _CLAIM_TYPES = {
+        'exp': (int, "ERROR_TIPO_DATO_INVALIDO: 'exp' debe ser NumericDate (int)."),
+        'nbf': (int, "ERROR_TIPO_DATO_INVALIDO: 'nbf' debe ser NumericDate (int)."),
+        'iat': (int, "ERROR_TIPO_DATO_INVALIDO: 'iat' debe ser NumericDate (int)."),
+        'iss': (str, "ERROR_TIPO_DATO_INVALIDO: 'iss' debe ser String."),
+        'sub': (str, "ERROR_TIPO_DATO_INVALIDO: 'sub' debe ser String."),
+    }
 
     def analyze(self, header_map, payload_map):
         t_actual = int(time.time())
@@ -35,6 +48,31 @@ class SemanticAnalyzer:
 
         return (header_map, payload_map)
 
+    def analyze_many(self, headers, payloads):
+        """
+        Valida en lote muchos pares (header, payload).
+
+        Retorna una lista paralela a las entradas: None si el par es
+        válido o el mensaje del error semántico encontrado. El tiempo
+        actual se lee una sola vez para todo el lote y los métodos de
+        validación se resuelven fuera del bucle, pensado para rutas de
+        verificación de alto volumen.
+        """
+        t_actual = int(time.time())
+        validate_header = self._validate_header
+        validate_payload = self._validate_payload
+        results = []
+        append = results.append
+        for h_map, p_map in zip(headers, payloads):
+            try:
+                validate_header(h_map)
+                validate_payload(p_map, t_actual)
+            except SemanticError as e:
+                append(str(e))
+            else:
+                append(None)
+        return results
+
     def _validate_header(self, h_map):
 
         if 'alg' not in h_map:
@@ -49,7 +87,7 @@ class SemanticAnalyzer:
         if not isinstance(h_map['typ'], str):
             raise InvalidDataTypeError("ERROR_TIPO_DATO_INVALIDO: El claim 'typ' debe ser un String.")
 
-        if h_map['alg'] not in self.supported_algorithms:
+        if h_map['alg'] not in self.SUPPORTED_ALGORITHMS:
             raise InvalidValueError(f"ERROR_VALOR_INVALIDO: El alg '{h_map['alg']}' no es soportado.")
 
         if h_map['typ'] != "JWT":
@@ -57,26 +95,17 @@ class SemanticAnalyzer:
 
     def _validate_payload(self, p_map, t_actual):
 
-        if 'exp' in p_map:
-            if not isinstance(p_map['exp'], int):
-                raise InvalidDataTypeError("ERROR_TIPO_DATO_INVALIDO: 'exp' debe ser NumericDate (int).")
-            if t_actual >= p_map['exp']:
-                raise ExpirationDateError(f"ERROR_TOKEN_EXPIRADO: El token expiró.")
+        for claim, (expected, mensaje) in self._CLAIM_TYPES.items():
+            if claim in p_map and type(p_map[claim]) is not expected:
+                raise InvalidDataTypeError(mensaje)
 
-        if 'nbf' in p_map:
-            if not isinstance(p_map['nbf'], int):
-                raise InvalidDataTypeError("ERROR_TIPO_DATO_INVALIDO: 'nbf' debe ser NumericDate (int).")
-            if t_actual < p_map['nbf']:
-                raise NotActiveTokenError("ERROR_TOKEN_NO_ACTIVO: El token aún no es válido.")
+        exp = p_map.get('exp')
+        if exp is not None and t_actual >= exp:
+            raise ExpirationDateError("ERROR_TOKEN_EXPIRADO: El token expiró.")
 
-        if 'iat' in p_map and not isinstance(p_map['iat'], int):
-            raise InvalidDataTypeError("ERROR_TIPO_DATO_INVALIDO: 'iat' debe ser NumericDate (int).")
-
-        if 'iss' in p_map and not isinstance(p_map['iss'], str):
-            raise InvalidDataTypeError("ERROR_TIPO_DATO_INVALIDO: 'iss' debe ser String.")
-
-        if 'sub' in p_map and not isinstance(p_map['sub'], str):
-            raise InvalidDataTypeError("ERROR_TIPO_DATO_INVALIDO: 'sub' debe ser String.")
+        nbf = p_map.get('nbf')
+        if nbf is not None and t_actual < nbf:
+            raise NotActiveTokenError("ERROR_TOKEN_NO_ACTIVO: El token aún no es válido.")
 
         if 'aud' in p_map:
             aud = p_map['aud']
@@ -84,4 +113,8 @@ class SemanticAnalyzer:
             es_list = isinstance(aud, list) and all(isinstance(s, str) for s in aud)
 
             if not (es_string or es_list):
-                raise InvalidDataTypeError("ERROR_TIPO_DATO_INVALIDO: 'aud' debe ser String o Arreglo de Strings.")
\ No newline at end of file
+                raise InvalidDataTypeError("ERROR_TIPO_DATO_INVALIDO: 'aud' debe ser String o Arreglo de Strings.")
+
+# Instancia compartida: el analizador no guarda estado entre llamadas,
+# así que los llamadores pueden reutilizarla en vez de instanciar una nueva
+DEFAULT_SEMANTIC_ANALYZER = SemanticAnalyzer()
@@ -8,14 +8,23 @@
 ANALIZADOR SINTÁCTICO (PROYECTO JWT)
 -----------------------------------------------------------
 Incluye:
-- Parser JSON manual (parcial) basado en la GLC.
-- Fallback a json.loads por si no funciona el parser manual.
+- Parser JSON manual (parcial) basado en la GLC (solo con use_manual=True).
+- json.loads (acelerado en C) como parser por defecto.
 - Validaciones estructurales del header y payload.
 - typ != "JWT" tratado como error fatal.
 """
 
 import json
 
+# orjson (Rust, SIMD) parsea 3-5x más rápido que el módulo json de C;
+# si no está instalado se usa json.loads sin cambio de comportamiento
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+
 class JSONParseError(Exception):
     pass
 
@@ -66,52 +75,61 @@ class JSONParser:
         if self.peek() != '"':
             raise JSONParseError("Se esperaba inicio de string.")
         self.i += 1
-        out = ""
+        # Acumular en una lista y unir al final: out += c crea un string
+        # nuevo por iteración (O(n^2) en el peor caso)
+        parts = []
         while self.i < len(self.text):
             c = self.text[self.i]
             if c == '"':
                 self.i += 1
-                return out
+                return ''.join(parts)
             if c == '\\':
                 if self.i + 1 >= len(self.text):
                     raise JSONParseError("Escape incompleto.")
                 nxt = self.text[self.i+1]
                 if nxt in ['"', '\\', '/']:
-                    out += nxt
+                    parts.append(nxt)
                     self.i += 2
                 elif nxt == 'n':
-                    out += '\n'; self.i += 2
+                    parts.append('\n'); self.i += 2
                 elif nxt == 't':
-                    out += '\t'; self.i += 2
+                    parts.append('\t'); self.i += 2
                 elif nxt == 'r':
-                    out += '\r'; self.i += 2
+                    parts.append('\r'); self.i += 2
                 elif nxt == 'u':
                     hexv = self.text[self.i+2:self.i+6]
                     if len(hexv) < 4:
                         raise JSONParseError("Unicode incompleto.")
-                    out += chr(int(hexv, 16))
+                    parts.append(chr(int(hexv, 16)))
                     self.i += 6
                 else:
                     raise JSONParseError("Escape inválido.")
             else:
-                out += c; self.i += 1
+                parts.append(c); self.i += 1
         raise JSONParseError("String no cerrado.")
 
     def parse_number(self):
         self.skip_ws()
-        start = self.i
-        if self.peek() == '-': self.i += 1
-        if not self.peek() or not self.peek().isdigit():
+        # Operar sobre locales: cada self.peek() re-ejecuta skip_ws y
+        # búsquedas de atributo por dígito
+        text = self.text
+        n = len(text)
+        i = self.i
+        start = i
+        if i < n and text[i] == '-':
+            i += 1
+        if i >= n or not text[i].isdigit():
             raise JSONParseError("Número inválido.")
-        while self.peek() and self.peek().isdigit():
-            self.i += 1
-        if self.peek() == '.':
-            self.i += 1
-            if not self.peek() or not self.peek().isdigit():
+        while i < n and text[i].isdigit():
+            i += 1
+        if i < n and text[i] == '.':
+            i += 1
+            if i >= n or not text[i].isdigit():
                 raise JSONParseError("Decimal inválido.")
-            while self.peek() and self.peek().isdigit():
-                self.i += 1
-        num_str = self.text[start:self.i]
+            while i < n and text[i].isdigit():
+                i += 1
+        self.i = i
+        num_str = text[start:i]
         try:
             if '.' in num_str:
                 return float(num_str)
@@ -167,33 +185,26 @@ def parse_json_manual(text):
     return JSONParser(text).parse()
 
 
-def analyze_syntax(header_str, payload_str):
-    result = {"success": True, "valid": False, "header": None, "payload": None, "errors": []}
-
-    # PARSE HEADER
-    try:
-        try: header = parse_json_manual(header_str)
-        except: header = json.loads(header_str)
-    except Exception as e:
-        result["errors"].append("Header inválido: " + str(e))
-        return result
-
-    # PARSE PAYLOAD
-    try:
-        try: payload = parse_json_manual(payload_str)
-        except: payload = json.loads(payload_str)
-    except Exception as e:
-        result["errors"].append("Payload inválido: " + str(e))
-        return result
+def _parse_and_validate_header(header_str, use_manual, result):
+    """Parsea el header y acumula sus errores estructurales en result."""
+    if isinstance(header_str, str):
+        try:
+            if use_manual:
+                header = parse_json_manual(header_str)
+            else:
+                header = _json_loads(header_str)
+        except Exception as e:
+            result["errors"].append("Header inválido: " + str(e))
+            return
+    else:
+        # Ya es un objeto en memoria (dict): no hay nada que parsear
+        header = header_str
 
     result["header"] = header
-    result["payload"] = payload
 
-    # VALIDACIONES
     if not isinstance(header, dict):
         result["errors"].append("Header debe ser objeto JSON.")
-    if not isinstance(payload, dict):
-        result["errors"].append("Payload debe ser objeto JSON.")
+        return
 
     if "alg" not in header:
         result["errors"].append("Header faltante 'alg'.")
@@ -203,6 +214,28 @@ def analyze_syntax(header_str, payload_str):
         if header["typ"] != "JWT":
             result["errors"].append("Header 'typ' debe ser exactamente 'JWT' (FATAL).")
 
+
+def _parse_and_validate_payload(payload_str, use_manual, result):
+    """Parsea el payload y acumula sus errores estructurales en result."""
+    if isinstance(payload_str, str):
+        try:
+            if use_manual:
+                payload = parse_json_manual(payload_str)
+            else:
+                payload = _json_loads(payload_str)
+        except Exception as e:
+            result["errors"].append("Payload inválido: " + str(e))
+            return
+    else:
+        # Ya es un objeto en memoria (dict): no hay nada que parsear
+        payload = payload_str
+
+    result["payload"] = payload
+
+    if not isinstance(payload, dict):
+        result["errors"].append("Payload debe ser objeto JSON.")
+        return
+
     for t in ("iat", "exp", "nbf"):
         if t in payload and not isinstance(payload[t], int):
             result["errors"].append(f"Claim '{t}' debe ser entero.")
@@ -220,6 +253,29 @@ def analyze_syntax(header_str, payload_str):
         if not (isinstance(perms, list) and all(isinstance(p, str) for p in perms)):
             result["errors"].append("Claim 'permissions' debe ser lista de strings.")
 
+
+def analyze_syntax(header_str, payload_str, use_manual=False):
+    """
+    Analiza la sintaxis del header y payload JSON.
+
+    Acepta strings JSON (se parsean) o diccionarios ya construidos (se
+    validan directamente, sin el ciclo serializar→parsear).
+
+    Valida primero el header y corta temprano si es inválido (typ != "JWT"
+    es fatal), evitando el costo de parsear el payload de tokens rechazados.
+
+    Por defecto usa json.loads (implementado en C, mucho más rápido).
+    Con use_manual=True usa el parser manual basado en la GLC, útil
+    para demostraciones de correctitud del parser del proyecto.
+    """
+    result = {"success": True, "valid": False, "header": None, "payload": None, "errors": []}
+
+    _parse_and_validate_header(header_str, use_manual, result)
+    if result["errors"]:
+        return result
+
+    _parse_and_validate_payload(payload_str, use_manual, result)
+
     if not result["errors"]:
         result["valid"] = True
 
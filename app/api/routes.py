@@ -5,11 +5,42 @@ Define los endpoints REST para el análisis léxico, decodificación, sintactico
 Se aplica como interfaz HTTP para el frontend y clientes externos.
 """
 
-from flask import Blueprint, jsonify, request
-from app.analyzer.lexical_analyzer import JWTLexer
-from app.analyzer.decoder_json import get_decoded_strings
-from app.analyzer.encoder import encode_jwt
-from app.analyzer.crypto_verifier import verify_jwt_signature
+import asyncio
+import hashlib
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import cache
+
+from flask import Blueprint, Response, jsonify, request, stream_with_context
+
+# orjson serializa 2-5x más rápido y emite bytes directamente; fallback
+# al json de stdlib si no está instalado
+try:
+    import orjson
+    _dumps_bytes = orjson.dumps
+    _loads = orjson.loads
+
+    def _dumps_sorted(obj):
+        return orjson.dumps(obj, option=orjson.OPT_SORT_KEYS)
+except ImportError:
+    import json as _json_std
+
+    def _dumps_bytes(obj):
+        return _json_std.dumps(obj).encode('utf-8')
+
+    _loads = _json_std.loads
+
+    def _dumps_sorted(obj):
+        return _json_std.dumps(obj, sort_keys=True).encode('utf-8')
+# Las excepciones semánticas se quedan a nivel de módulo: las necesita la
+# cláusula except y el mapa de despacho, y el módulo es liviano. Los demás
+# analizadores y el servicio de base de datos se importan perezosamente en
+# cada vista (sys.modules cachea, solo la primera llamada paga el import),
+# para que workers que solo sirven /health o /jwts no los carguen.
 from app.analyzer.semantic_analyzer import (
     SemanticAnalyzer,
     SemanticError,
@@ -19,14 +50,196 @@ from app.analyzer.semantic_analyzer import (
     ExpirationDateError,
     NotActiveTokenError
 )
-from app.analyzer.syntactic_analyzer import analyze_syntax
-from app.services.database_service import DatabaseService
 
 
 api_bp = Blueprint('api', __name__)
-jwt_lexer = JWTLexer()
 semantic_analyzer = SemanticAnalyzer()
 
+
+@cache
+def _lexer():
+    """Construye (una sola vez) el analizador léxico compartido."""
+    from app.analyzer.lexical_analyzer import JWTLexer
+    return JWTLexer()
+
+# Despacho precomputado de errores semánticos: un solo except SemanticError
+# + lookup por tipo concreto, en lugar de la escalera lineal de 6 except
+# (CPython compara clase por clase en cada rama no coincidente). El .get
+# con fallback cubre subclases futuras de SemanticError no registradas.
+_SEMANTIC_ERR_MAP = {
+    MissingClaimError: ('MissingClaimError', 400),
+    InvalidDataTypeError: ('InvalidDataTypeError', 400),
+    InvalidValueError: ('InvalidValueError', 400),
+    ExpirationDateError: ('ExpirationDateError', 400),
+    NotActiveTokenError: ('NotActiveTokenError', 400),
+    SemanticError: ('SemanticError', 400),
+}
+
+
+def _semantic_error_response(e):
+    """Construye la respuesta JSON de error para una excepción semántica."""
+    error_type, code = _SEMANTIC_ERR_MAP.get(type(e), ('SemanticError', 400))
+    return jsonify({
+        'success': False,
+        'error': str(e),
+        'error_type': error_type
+    }), code
+
+
+def _json_body():
+    """
+    Lee y parsea el cuerpo JSON de la petición actual.
+
+    Evita el sniffing de Content-Type y la re-validación de Werkzeug en
+    request.get_json(), parseando los bytes crudos una sola vez con el
+    parser en C. Retorna None si el cuerpo viene vacío; lanza ValueError
+    si el JSON es inválido (las vistas lo convierten en 500 como antes).
+    """
+    raw = request.get_data(cache=False)
+    if not raw:
+        return None
+    return _loads(raw)
+
+
+class _BodyValidator:
+    """
+    Validador de forma precompilado para los cuerpos POST.
+
+    Cada vista declara una sola vez sus campos como tuplas
+    (clave, tipo_o_None, mensaje_falta, mensaje_tipo) y la validación se
+    reduce a un bucle sobre esa tupla, en lugar de repetir la escalera de
+    isinstance/'in' en cada handler. Retorna (data, None) o (None, error).
+    """
+
+    __slots__ = ('campos',)
+
+    def __init__(self, *campos):
+        self.campos = campos
+
+    def __call__(self):
+        data = _json_body()
+        if not data:
+            return None, 'No se recibió JSON en el cuerpo de la solicitud'
+        if not isinstance(data, dict):
+            return None, self.campos[0][2]
+        for clave, tipo, falta, mal_tipo in self.campos:
+            if clave not in data:
+                return None, falta
+            if tipo is not None and not isinstance(data[clave], tipo):
+                return None, mal_tipo
+        return data, None
+
+
+class _TTLCache:
+    """
+    Caché TTL + LRU mínima y thread-safe (solo stdlib).
+
+    Acotada en tamaño: al superar maxsize se expulsa la entrada menos
+    recientemente usada. Cada entrada guarda su propio vencimiento.
+    """
+
+    def __init__(self, maxsize, ttl):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        now = time.monotonic()
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            expira, valor = item
+            if expira < now:
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return valor
+
+    def set(self, key, value, ttl=None):
+        expira = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._data[key] = (expira, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+
+# Caché opt-in para /analyze/crypto-verification: el mismo token+secreto
+# re-presentado (harnesses de prueba, ráfagas) colapsa de un HMAC completo
+# a una búsqueda en dict. Los resultados inválidos se cachean solo 1s
+# para acotar el radio de impacto de una entrada negativa.
+_TRUTHY = frozenset(('true', '1', 'yes', 'on', 'y', 't'))
+_VERIFY_CACHE_ENABLED = os.getenv('VERIFY_CACHE_ENABLED', 'False').lower() in _TRUTHY
+_VERIFY_CACHE_TTL_VALID = 5
+_VERIFY_CACHE_TTL_INVALID = 1
+_verify_cache = _TTLCache(maxsize=10_000, ttl=_VERIFY_CACHE_TTL_VALID)
+
+# Specs de validación de cada endpoint POST, compilados una sola vez
+_DECODER_BODY = _BodyValidator(
+    ('header', None,
+     'El JSON debe contener el resultado del análisis léxico con "header" y "payload"', None),
+    ('payload', None,
+     'El JSON debe contener el resultado del análisis léxico con "header" y "payload"', None),
+)
+_SEMANTIC_BODY = _BodyValidator(
+    ('header', dict,
+     'El JSON debe contener "header" y "payload" como diccionarios',
+     'Los campos "header" y "payload" deben ser diccionarios'),
+    ('payload', dict,
+     'El JSON debe contener "header" y "payload" como diccionarios',
+     'Los campos "header" y "payload" deben ser diccionarios'),
+)
+_ENCODER_BODY = _BodyValidator(
+    ('header', dict,
+     'El JSON debe contener "header" y "payload" como objetos JSON',
+     'Los campos "header" y "payload" deben ser objetos JSON (diccionarios)'),
+    ('payload', dict,
+     'El JSON debe contener "header" y "payload" como objetos JSON',
+     'Los campos "header" y "payload" deben ser objetos JSON (diccionarios)'),
+)
+_VERIFY_BODY = _BodyValidator(
+    ('jwt', str,
+     'El JSON debe contener el campo "jwt" con el token JWT completo',
+     'El campo "jwt" debe ser un string'),
+    ('secret', str,
+     'El JSON debe contener el campo "secret" con la clave secreta',
+     'El campo "secret" debe ser un string'),
+)
+_SYNTAX_BODY = _BodyValidator(
+    ('result', list,
+     'Formato inválido. Se esperaba {"result": ["header", "payload"]}',
+     'Formato inválido. Se esperaba {"result": ["header", "payload"]}'),
+)
+_BATCH_VERIFY_BODY = _BodyValidator(
+    ('items', list,
+     'El JSON debe contener "items" con una lista de objetos {"jwt", "secret"}',
+     'El JSON debe contener "items" con una lista de objetos {"jwt", "secret"}'),
+)
+
+# Tope del lote de verificación: acota memoria y tiempo por petición
+_BATCH_VERIFY_MAX = 256
+
+# Memoización del análisis semántico: pares header/payload repetidos
+# (reintentos, harnesses) cuestan una búsqueda en dict en lugar de todos
+# los chequeos de tipo. Solo se cachean éxitos, y el TTL corto acota la
+# ventana en la que un exp/nbf a punto de cruzar el reloj podría servirse
+# desde caché.
+_SEMANTIC_CACHE_TTL = 5
+_semantic_cache = _TTLCache(maxsize=4096, ttl=_SEMANTIC_CACHE_TTL)
+
+# Pool compartido para la verificación HMAC: hmac/hashlib sueltan el GIL
+# alrededor de la llamada a OpenSSL, así que hilos dan paralelismo real en
+# SHA-256/384 y el throughput de verificaciones concurrentes escala con
+# los cores en lugar de serializarse en el worker de Flask.
+_verify_executor = ThreadPoolExecutor(max_workers=os.cpu_count())
+
+# Compuerta léxica O(n) para la verificación: tres segmentos base64url con
+# longitudes acotadas. Entradas malformadas o desmesuradas se rechazan con
+# un solo escaneo del regex compilado, sin llegar al split/decode/HMAC.
+_JWT_RE = re.compile(r'^[A-Za-z0-9_-]{1,4096}\.[A-Za-z0-9_-]{1,8192}\.[A-Za-z0-9_-]{1,512}$')
+
 @api_bp.route('/analyze/lexical/<string:jwt>', methods=['GET'])
 def analyze_jwt(jwt):
     """
@@ -36,7 +249,7 @@ def analyze_jwt(jwt):
     Se aplica como primer paso en el proceso de análisis de JWT.
     """
     try:
-        result = jwt_lexer.analyze(jwt)
+        result = _lexer().analyze(jwt)
         return jsonify({
             'success': True,
             'result': result
@@ -57,20 +270,14 @@ def analyze_jwt_decoder():
     del análisis léxico (Fase 1) para obtener los JSON decodificados (Fase 4).
     """
     try:
-        data = request.get_json()
-        
-        if not data:
+        data, error = _DECODER_BODY()
+        if error:
             return jsonify({
                 'success': False,
-                'error': 'No se recibió JSON en el cuerpo de la solicitud'
+                'error': error
             }), 400
-        
-        if not isinstance(data, dict) or 'header' not in data or 'payload' not in data:
-            return jsonify({
-                'success': False,
-                'error': 'El JSON debe contener el resultado del análisis léxico con "header" y "payload"'
-            }), 400
-        
+
+        from app.analyzer.decoder_json import get_decoded_strings
         result = get_decoded_strings(data)
         
         return jsonify({
@@ -91,31 +298,28 @@ def analyze_jwt_semantic():
     Recibe header y payload como diccionarios y valida las reglas semánticas.
     """
     try:
-        data = request.get_json()
-        
-        if not data:
-            return jsonify({
-                'success': False,
-                'error': 'No se recibió JSON en el cuerpo de la solicitud'
-            }), 400
-        
-        if 'header' not in data or 'payload' not in data:
+        data, error = _SEMANTIC_BODY()
+        if error:
             return jsonify({
                 'success': False,
-                'error': 'El JSON debe contener "header" y "payload" como diccionarios'
+                'error': error
             }), 400
-        
+
         header_map = data['header']
         payload_map = data['payload']
-        
-        if not isinstance(header_map, dict) or not isinstance(payload_map, dict):
-            return jsonify({
-                'success': False,
-                'error': 'Los campos "header" y "payload" deben ser diccionarios'
-            }), 400
-        
-        # Realizar análisis semántico
-        result = semantic_analyzer.analyze(header_map, payload_map)
+
+        # Realizar análisis semántico (memoizado por huella del par
+        # header/payload; claves no serializables saltan la caché)
+        try:
+            cache_key = (_dumps_sorted(header_map), _dumps_sorted(payload_map))
+        except TypeError:
+            cache_key = None
+
+        result = _semantic_cache.get(cache_key) if cache_key is not None else None
+        if result is None:
+            result = semantic_analyzer.analyze(header_map, payload_map)
+            if cache_key is not None:
+                _semantic_cache.set(cache_key, result)
         
         return jsonify({
             'success': True,
@@ -125,42 +329,8 @@ def analyze_jwt_semantic():
                 'valid': True
             }
         })
-    except MissingClaimError as e:
-        return jsonify({
-            'success': False,
-            'error': str(e),
-            'error_type': 'MissingClaimError'
-        }), 400
-    except InvalidDataTypeError as e:
-        return jsonify({
-            'success': False,
-            'error': str(e),
-            'error_type': 'InvalidDataTypeError'
-        }), 400
-    except InvalidValueError as e:
-        return jsonify({
-            'success': False,
-            'error': str(e),
-            'error_type': 'InvalidValueError'
-        }), 400
-    except ExpirationDateError as e:
-        return jsonify({
-            'success': False,
-            'error': str(e),
-            'error_type': 'ExpirationDateError'
-        }), 400
-    except NotActiveTokenError as e:
-        return jsonify({
-            'success': False,
-            'error': str(e),
-            'error_type': 'NotActiveTokenError'
-        }), 400
     except SemanticError as e:
-        return jsonify({
-            'success': False,
-            'error': str(e),
-            'error_type': 'SemanticError'
-        }), 400
+        return _semantic_error_response(e)
     except Exception as e:
         return jsonify({
             'success': False,
@@ -176,29 +346,16 @@ def encode_jwt_endpoint():
     codificado en Base64URL y firmado con el algoritmo especificado (HS256 o HS384).
     """
     try:
-        data = request.get_json()
-        
-        if not data:
-            return jsonify({
-                'success': False,
-                'error': 'No se recibió JSON en el cuerpo de la solicitud'
-            }), 400
-        
-        if 'header' not in data or 'payload' not in data:
+        data, error = _ENCODER_BODY()
+        if error:
             return jsonify({
                 'success': False,
-                'error': 'El JSON debe contener "header" y "payload" como objetos JSON'
+                'error': error
             }), 400
-        
+
         header = data['header']
         payload = data['payload']
-        
-        if not isinstance(header, dict) or not isinstance(payload, dict):
-            return jsonify({
-                'success': False,
-                'error': 'Los campos "header" y "payload" deben ser objetos JSON (diccionarios)'
-            }), 400
-        
+
         # Obtener la clave secreta (opcional, por defecto "secret")
         secret = data.get('secret', 'secret')
         
@@ -209,6 +366,7 @@ def encode_jwt_endpoint():
             }), 400
         
         # Codificar y firmar el JWT
+        from app.analyzer.encoder import encode_jwt
         jwt_token = encode_jwt(header, payload, secret)
         
         return jsonify({
@@ -227,7 +385,7 @@ def encode_jwt_endpoint():
         }), 500
 
 @api_bp.route('/analyze/crypto-verification', methods=['POST'])
-def verify_jwt_crypto():
+async def verify_jwt_crypto():
     """
     Endpoint para verificación criptográfica de JWT.
     
@@ -236,43 +394,44 @@ def verify_jwt_crypto():
     adjunta en el token, validando así la integridad criptográfica.
     """
     try:
-        data = request.get_json()
-        
-        if not data:
-            return jsonify({
-                'success': False,
-                'error': 'No se recibió JSON en el cuerpo de la solicitud'
-            }), 400
-        
-        if 'jwt' not in data:
-            return jsonify({
-                'success': False,
-                'error': 'El JSON debe contener el campo "jwt" con el token JWT completo'
-            }), 400
-        
-        if 'secret' not in data:
+        data, error = _VERIFY_BODY()
+        if error:
             return jsonify({
                 'success': False,
-                'error': 'El JSON debe contener el campo "secret" con la clave secreta'
+                'error': error
             }), 400
-        
+
         jwt_token = data['jwt']
         secret = data['secret']
-        
-        if not isinstance(jwt_token, str):
-            return jsonify({
-                'success': False,
-                'error': 'El campo "jwt" debe ser un string'
-            }), 400
-        
-        if not isinstance(secret, str):
+
+        if not _JWT_RE.match(jwt_token):
             return jsonify({
                 'success': False,
-                'error': 'El campo "secret" debe ser un string'
+                'error': 'El JWT está malformado: se esperan tres segmentos Base64URL separados por puntos'
             }), 400
-        
-        # Verificar la firma criptográfica
-        result = verify_jwt_signature(jwt_token, secret)
+
+        # Verificar la firma criptográfica en el pool compartido (con caché
+        # opt-in por token+secreto)
+        from app.analyzer.crypto_verifier import verify_jwt_signature
+        if _VERIFY_CACHE_ENABLED:
+            cache_key = (
+                hashlib.sha256(jwt_token.encode()).digest(),
+                hashlib.sha256(secret.encode()).digest()
+            )
+            result = _verify_cache.get(cache_key)
+            if result is None:
+                result = await asyncio.wrap_future(
+                    _verify_executor.submit(verify_jwt_signature, jwt_token, secret)
+                )
+                _verify_cache.set(
+                    cache_key,
+                    result,
+                    ttl=_VERIFY_CACHE_TTL_VALID if result['valid'] else _VERIFY_CACHE_TTL_INVALID
+                )
+        else:
+            result = await asyncio.wrap_future(
+                _verify_executor.submit(verify_jwt_signature, jwt_token, secret)
+            )
         
         if result['valid']:
             return jsonify({
@@ -297,6 +456,89 @@ def verify_jwt_crypto():
             'error': str(e)
         }), 500
 
+def _verify_item(index, item):
+    """
+    Verifica un elemento del lote y retorna su resultado indexado.
+
+    Corre dentro del pool compartido; valida la forma del item y aplica la
+    misma compuerta léxica que el endpoint unitario antes del HMAC.
+    """
+    from app.analyzer.crypto_verifier import verify_jwt_signature
+
+    if (not isinstance(item, dict)
+            or not isinstance(item.get('jwt'), str)
+            or not isinstance(item.get('secret'), str)):
+        return {
+            'index': index,
+            'valid': False,
+            'error': 'Cada item debe ser un objeto con "jwt" y "secret" como strings'
+        }
+
+    if not _JWT_RE.match(item['jwt']):
+        return {
+            'index': index,
+            'valid': False,
+            'error': 'El JWT está malformado: se esperan tres segmentos Base64URL separados por puntos'
+        }
+
+    result = verify_jwt_signature(item['jwt'], item['secret'])
+    if result['valid']:
+        return {
+            'index': index,
+            'valid': True,
+            'algorithm': result['algorithm'],
+            'header': result['header'],
+            'payload': result['payload']
+        }
+    return {
+        'index': index,
+        'valid': False,
+        'error': result.get('error', 'Verificación fallida'),
+        'algorithm': result.get('algorithm'),
+        'header': result.get('header')
+    }
+
+
+@api_bp.route('/analyze/crypto-verification/batch', methods=['POST'])
+async def verify_jwt_crypto_batch():
+    """
+    Endpoint para verificación criptográfica de JWTs por lote.
+
+    Recibe {"items": [{"jwt": ..., "secret": ...}, ...]} (máximo 256) y
+    verifica cada elemento en paralelo sobre el pool compartido; cada
+    resultado lleva su índice, así que el orden de llegada no importa.
+    Los hilos bastan porque hashlib suelta el GIL durante el HMAC.
+    """
+    try:
+        data, error = _BATCH_VERIFY_BODY()
+        if error is None:
+            items = data['items']
+            if not items:
+                error = 'La lista "items" no puede estar vacía'
+            elif len(items) > _BATCH_VERIFY_MAX:
+                error = f'La lista "items" admite máximo {_BATCH_VERIFY_MAX} elementos'
+        if error:
+            return jsonify({
+                'success': False,
+                'error': error
+            }), 400
+
+        futures = [
+            _verify_executor.submit(_verify_item, index, item)
+            for index, item in enumerate(items)
+        ]
+        results = await asyncio.gather(*map(asyncio.wrap_future, futures))
+
+        return jsonify({
+            'success': True,
+            'results': list(results)
+        })
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
 @api_bp.route('/analyze/semantic_analyzer', methods=['POST'])
 
 @api_bp.route('/analyze/syntax', methods=['POST'])
@@ -306,25 +548,21 @@ def syntax_analyzer_endpoint():
     Recibe dos strings JSON provenientes del decoder.
     """
     try:
-        data = request.get_json()
-
-        if not data:
-            return jsonify({
-                'success': False,
-                'error': 'No se recibió JSON en el cuerpo de la solicitud'
-            }), 400
-
         # Se espera: { "result": ["json_header", "json_payload"] }
-        if "result" not in data or not isinstance(data["result"], list) or len(data["result"]) != 2:
+        data, error = _SYNTAX_BODY()
+        if error is None and len(data["result"]) != 2:
+            error = 'Formato inválido. Se esperaba {"result": ["header", "payload"]}'
+        if error:
             return jsonify({
                 'success': False,
-                'error': 'Formato inválido. Se esperaba {"result": ["header", "payload"]}'
+                'error': error
             }), 400
 
         header_str = data["result"][0]  # STRING JSON
         payload_str = data["result"][1] # STRING JSON
 
         # Llamar a tu analizador sintáctico
+        from app.analyzer.syntactic_analyzer import analyze_syntax
         result = analyze_syntax(header_str, payload_str)
 
         return jsonify({
@@ -343,41 +581,58 @@ def syntax_analyzer_endpoint():
 def get_jwts():
     """
     Endpoint para obtener la lista de todos los JWTs de la base de datos.
-    
+
     Retorna una lista de JWTs con su información completa.
+
+    La respuesta se transmite en streaming desde el cursor de PyMongo (sin
+    materializar la lista ni el JSON completo en memoria), manteniendo el
+    sobre {"success": true, "jwts": [...]} que espera el frontend. Esto
+    reduce la RAM pico y el tiempo al primer byte; los round-trips a Mongo
+    ocurren por lotes durante la propia escritura de la respuesta.
     """
     try:
-        jwts = DatabaseService.get_all_jwts()
-        
-        # Transformar los datos al formato esperado por el frontend
-        formatted_jwts = []
-        for jwt in jwts:
-            # Obtener el secreto directamente
-            secreto_valor = jwt.get('secreto')
-            
-            # Construir el diccionario asegurando que secreto siempre esté presente
-            # Usar un valor por defecto si es None para evitar que Flask lo omita
-            formatted_jwt = {
-                'id': str(jwt.get('_id', '')),
-                'token': str(jwt.get('token', '')),
-                'name': str(jwt.get('name', f"JWT {str(jwt.get('_id', ''))[:8]}")),
-                'createdAt': str(jwt.get('createdAt', jwt.get('_id', ''))),
-                'valido': jwt.get('valido'),
-                'secreto': str(secreto_valor) if secreto_valor is not None else '',  # Usar string vacío en lugar de None
-            }
-            
-            # Agregar tipo_error si existe
-            if 'tipo_error' in jwt:
-                formatted_jwt['tipo_error'] = str(jwt['tipo_error'])
-            else:
-                formatted_jwt['tipo_error'] = None
-            
-            formatted_jwts.append(formatted_jwt)
-        
-        return jsonify({
-            'success': True,
-            'jwts': formatted_jwts
-        })
+        from app.services.database_service import DatabaseService
+
+        # ETag sobre la huella de la colección: si el cliente ya tiene esta
+        # versión, un 304 evita la consulta completa y la serialización
+        etag = DatabaseService.get_jwts_etag()
+        if etag is not None and request.headers.get('If-None-Match') == etag:
+            return '', 304
+
+        cursor = DatabaseService.iter_all_jwts()
+
+        def generate():
+            yield b'{"success": true, "jwts": ['
+            first = True
+            for jwt in cursor:
+                # La agregación ya entrega _id como string y solo los campos
+                # necesarios; aquí solo quedan los defaults para campos ausentes.
+                # Un solo bind de jwt.get por documento (en lugar de 7 LOAD_METHOD)
+                # y el dict se construye de una pasada
+                get = jwt.get
+                doc_id = get('_id') or ''
+                created_at = get('createdAt')
+                chunk = _dumps_bytes({
+                    'id': doc_id,
+                    'token': get('token') or '',
+                    'name': get('name') or f"JWT {doc_id[:8]}",
+                    'createdAt': str(created_at if created_at is not None else doc_id),
+                    'valido': get('valido'),
+                    # String vacío en lugar de None para que el front siempre lo vea
+                    'secreto': get('secreto') or '',
+                    'tipo_error': get('tipo_error'),
+                })
+                if first:
+                    first = False
+                else:
+                    chunk = b',' + chunk
+                yield chunk
+            yield b']}'
+
+        response = Response(stream_with_context(generate()), mimetype='application/json')
+        if etag is not None:
+            response.headers['ETag'] = etag
+        return response
     except Exception as e:
         # Log del error para debugging
         print(f"Error en get_jwts: {str(e)}")
@@ -390,15 +645,19 @@ def get_jwts():
         }), 500
 
 
+# Cuerpo de /health pre-serializado: los probes de liveness lo piden cada
+# pocos segundos y la respuesta nunca cambia, así que cada hit es una
+# copia de bytes constante sin pasar por jsonify
+_HEALTH_BYTES = b'{"status":"healthy","message":"API is running"}'
+
+
 @api_bp.route('/health', methods=['GET'])
 def health_check():
     """
     Endpoint de verificación de salud de la API.
-    
+
     Retorna el estado de la API. Se aplica para monitoreo y verificación
     de que el servicio está en funcionamiento.
     """
-    return jsonify({
-        'status': 'healthy',
-        'message': 'API is running'
-    })
+    return Response(_HEALTH_BYTES, mimetype='application/json',
+                    headers={'Cache-Control': 'no-store'})
@@ -13,28 +13,81 @@ data_dir = os.path.join(backend_dir, 'data')
 if data_dir not in sys.path:
     sys.path.insert(0, data_dir)
 
-from crud import obtener_todos, obtener_por_id, insertar_uno, actualizar_por_id, eliminar_por_id
+import hashlib
+
+from crud import obtener_todos, iterar_todos, huella_coleccion, obtener_por_id, insertar_uno, actualizar_por_id, eliminar_por_id
 
 
 class DatabaseService:
     """Servicio para operaciones de base de datos con JWTs."""
     
     COLLECTION_NAME = "JWTS"
-    
+
+    # Proyección con _id ya convertido a string del lado del servidor:
+    # evita el bucle Python de stringificación y trae solo estos campos
+    JWT_PROJECTION = {
+        "_id": {"$toString": "$_id"},
+        "token": 1,
+        "name": 1,
+        "createdAt": 1,
+        "valido": 1,
+        "secreto": 1,
+        "tipo_error": 1,
+    }
+
     @staticmethod
     def get_all_jwts():
         """
         Obtiene todos los JWTs de la base de datos.
-        
+
         Returns:
             list: Lista de documentos JWT con _id convertido a string
         """
         try:
-            jwts = obtener_todos(DatabaseService.COLLECTION_NAME)
+            jwts = obtener_todos(
+                DatabaseService.COLLECTION_NAME,
+                projection=DatabaseService.JWT_PROJECTION
+            )
             return jwts
         except Exception as e:
             raise Exception(f"Error al obtener JWTs de la base de datos: {str(e)}")
     
+    @staticmethod
+    def iter_all_jwts():
+        """
+        Itera los JWTs de la base de datos sin materializar la lista.
+
+        Returns:
+            Cursor de PyMongo con los documentos proyectados (_id como string)
+        """
+        try:
+            return iterar_todos(
+                DatabaseService.COLLECTION_NAME,
+                projection=DatabaseService.JWT_PROJECTION
+            )
+        except Exception as e:
+            raise Exception(f"Error al obtener JWTs de la base de datos: {str(e)}")
+
+    @staticmethod
+    def get_jwts_etag():
+        """
+        Calcula un ETag barato del estado de la colección de JWTs.
+
+        La huella combina el conteo estimado y el último _id (cambia con
+        inserciones y borrados), así que polls repetidos sin cambios pueden
+        resolverse con un 304 sin re-serializar la lista.
+
+        Returns:
+            str: ETag entre comillas, o None si la consulta falla
+        """
+        try:
+            conteo, ultimo_id = huella_coleccion(DatabaseService.COLLECTION_NAME)
+            digest = hashlib.sha256(f"{conteo}:{ultimo_id}".encode()).hexdigest()[:16]
+            return f'"{digest}"'
+        except Exception:
+            # Sin huella no hay 304, pero el endpoint sigue funcionando
+            return None
+
     @staticmethod
     def get_jwt_by_id(jwt_id):
         """
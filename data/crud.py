@@ -20,10 +20,30 @@ coleccion : es el nombre de la base de datos que se va a usar en MONGO ATLAS
 documento: son los datos a insertar/modifcar o elimnar
 """
 
+from bson.errors import InvalidId
 from bson.objectid import ObjectId
 from db import db
 
 
+def _coerce_oid(id_documento):
+    """
+    Convierte un ID a ObjectId, o None si es inválido.
+
+    Si ya es un ObjectId se retorna tal cual (bson lo re-validaría).
+    Con IDs malformados se falla rápido en el proceso, sin pagar el
+    round-trip a Mongo que de todos modos no encontraría nada.
+    """
+    if isinstance(id_documento, ObjectId):
+        return id_documento
+    if id_documento is None:
+        # ObjectId(None) genera un ID nuevo en lugar de fallar
+        return None
+    try:
+        return ObjectId(id_documento)
+    except (InvalidId, TypeError):
+        return None
+
+
 # ===========================
 # 1. CREATE (INSERTAR DATOS)
 # ===========================
@@ -49,25 +69,60 @@ def insertar_varios(coleccion, lista_documentos):
 # 2. READ (LEER DATOS)
 # ===========================
 
-def obtener_todos(coleccion):
+def obtener_todos(coleccion, projection=None):
     """
     Obtiene todos los documentos de una colección.
-    Convierte ObjectId a string para evitar errores en el front.
+
+    Sin projection trae los documentos completos; con projection corre una
+    agregación $project para que Mongo emita solo los campos pedidos,
+    reduciendo los bytes que viajan por la red. En ambos casos los _id ya
+    llegan como string: el TypeDecoder registrado en db.py los convierte
+    durante el decode BSON, sin bucle de post-procesamiento en Python.
+    """
+    if projection is not None:
+        cursor = db[coleccion].aggregate(
+            [{"$project": projection}],
+            batchSize=500
+        )
+        return list(cursor)
+
+    return list(db[coleccion].find({}))
+
+
+def iterar_todos(coleccion, projection=None):
+    """
+    Igual que obtener_todos pero retorna el cursor sin materializar la
+    lista completa en memoria, para transmitir documentos uno a uno.
+    Los _id llegan como string en ambas rutas (TypeDecoder de db.py o
+    $toString en la projection).
+    """
+    if projection is not None:
+        return db[coleccion].aggregate(
+            [{"$project": projection}],
+            batchSize=500
+        )
+    return db[coleccion].find({})
+
+
+def huella_coleccion(coleccion):
+    """
+    Retorna (conteo_estimado, ultimo_id) como huella barata del estado
+    de la colección. estimated_document_count lee metadatos (no escanea)
+    y el último _id sale de una búsqueda puntual por el índice de _id.
     """
-    documentos = list(db[coleccion].find({}))
-    for d in documentos:
-        d["_id"] = str(d["_id"])
-    return documentos
+    ultimo = db[coleccion].find_one({}, projection={"_id": 1}, sort=[("_id", -1)])
+    return db[coleccion].estimated_document_count(), (ultimo or {}).get("_id")
 
 
 def obtener_por_id(coleccion, id_documento):
     """
     Obtiene un documento por su ID.
     """
-    documento = db[coleccion].find_one({"_id": ObjectId(id_documento)})
-    if documento:
-        documento["_id"] = str(documento["_id"])
-    return documento
+    oid = _coerce_oid(id_documento)
+    if oid is None:
+        return None
+    # El _id llega como string gracias al TypeDecoder de db.py
+    return db[coleccion].find_one({"_id": oid})
 
 
 # ===========================
@@ -79,8 +134,11 @@ def actualizar_por_id(coleccion, id_documento, nuevos_datos):
     Actualiza un documento por ID.
     nuevos_datos debe ser un diccionario con los campos a modificar.
     """
+    oid = _coerce_oid(id_documento)
+    if oid is None:
+        return False
     db[coleccion].update_one(
-        {"_id": ObjectId(id_documento)},
+        {"_id": oid},
         {"$set": nuevos_datos}
     )
     return True
@@ -94,7 +152,10 @@ def eliminar_por_id(coleccion, id_documento):
     """
     Elimina un documento por ID.
     """
-    db[coleccion].delete_one({"_id": ObjectId(id_documento)})
+    oid = _coerce_oid(id_documento)
+    if oid is None:
+        return False
+    db[coleccion].delete_one({"_id": oid})
     return True
 
 
@@ -1,34 +1,195 @@
 import os
+from functools import lru_cache
 from flask import Flask
-from flask_cors import CORS
-from dotenv import load_dotenv
-from app.api.routes import api_bp
+from flask.json.provider import JSONProvider
 
-# Cargar variables de entorno desde .env
-load_dotenv()
+# Cargar variables de entorno desde .env solo fuera de producción: bajo
+# Docker/Kubernetes/systemd el orquestador inyecta el entorno y parsear
+# el archivo en cada arranque no aporta nada. El parser es un split
+# mínimo en lugar de python-dotenv: para líneas KEY=VALUE simples no se
+# necesita la máquina de estados de regex/quoting de la librería.
+if os.getenv('APP_ENV', 'dev') != 'production':
+    try:
+        with open('.env') as _f:
+            for _line in _f:
+                _line = _line.strip()
+                if not _line or _line.startswith('#') or '=' not in _line:
+                    continue
+                _k, _v = _line.split('=', 1)
+                os.environ.setdefault(_k.strip(), _v.strip().strip('"').strip("'"))
+    except FileNotFoundError:
+        pass
 
+# Configuración parseada una sola vez a constantes de módulo: una única
+# fuente de verdad para la factory y el bloque __main__ (antes cada uno
+# re-parseaba DEBUG por su cuenta, con riesgo de divergir). frozenset da
+# membresía O(1) sin el tuple literal por llamada.
+_TRUTHY = frozenset(('true', '1', 'yes', 'on', 'y', 't'))
+_DEBUG = os.getenv('DEBUG', 'False').lower() in _TRUTHY
+_HOST = os.getenv('HOST', '0.0.0.0')
+_PORT = int(os.getenv('PORT', '5000'))
+# SECRET_KEY se valida una vez al arranque: en producción un default
+# silencioso invalidaría sesiones entre reinicios mal configurados, así
+# que se falla rápido; en desarrollo se conserva el valor de siempre
+_SECRET = os.getenv('SECRET_KEY')
+if not _SECRET:
+    if os.getenv('APP_ENV') == 'production':
+        raise RuntimeError("SECRET_KEY es obligatoria en producción (APP_ENV=production)")
+    _SECRET = 'amarillo-platano'
+_ALLOW_DEV_SERVER = os.getenv('ALLOW_DEV_SERVER') == '1'
+_GUNICORN_PRELOAD = bool(os.getenv('GUNICORN_PRELOAD'))
+
+# Headers CORS precalculados para respuestas reales: la política es un
+# wildcard fijo, así que no hace falta la cadena de filtros de flask_cors
+# (validación de origen por regex, resolución de opciones por petición);
+# escribir estos tres headers es todo el trabajo
+_CORS_HEADERS = (
+    ('Access-Control-Allow-Origin', '*'),
+    ('Access-Control-Allow-Methods', 'GET,POST,PUT,DELETE,OPTIONS'),
+    ('Access-Control-Allow-Headers', 'Content-Type,Authorization'),
+)
+
+# Respuesta de preflight precalculada: los OPTIONS de los navegadores no
+# necesitan ejecutar ninguna vista, así que se responden con un 204 y
+# estos headers fijos sin entrar siquiera al dispatch de Flask
+_PREFLIGHT_HEADERS = (
+    ('Access-Control-Allow-Origin', '*'),
+    ('Access-Control-Allow-Methods', 'GET,POST,PUT,DELETE,OPTIONS'),
+    ('Access-Control-Allow-Headers', 'Content-Type,Authorization'),
+    ('Access-Control-Max-Age', '3600'),
+    ('Content-Length', '0'),
+)
+
+
+def _cors_wsgi(wsgi_app):
+    """
+    Middleware WSGI que termina los preflights OPTIONS sobre Flask.
+
+    Responder en esta capa evita construir el Request, empujar el
+    RequestContext, rutear y recorrer los hooks before/after_request:
+    el preflight cuesta un start_response y nada más. Las peticiones
+    reales pasan intactas al app.
+    """
+    preflight = list(_PREFLIGHT_HEADERS)
+
+    def wrapped(environ, start_response):
+        if environ.get('REQUEST_METHOD') == 'OPTIONS':
+            start_response('204 No Content', preflight)
+            return [b'']
+        return wsgi_app(environ, start_response)
+
+    return wrapped
+
+# orjson (C, SIMD) codifica/decodifica JSON 2-5x más rápido que el json de
+# stdlib; registrado como provider, jsonify() y request.get_json() lo usan
+# en todos los endpoints sin cambiar ninguna ruta. Si no está instalado,
+# Flask conserva su provider por defecto.
+try:
+    import orjson
+
+    class ORJSONProvider(JSONProvider):
+        """Provider JSON de Flask respaldado por orjson."""
+
+        def dumps(self, obj, **kwargs):
+            return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode('utf-8')
+
+        def loads(self, s, **kwargs):
+            return orjson.loads(s)
+
+        def response(self, *args, **kwargs):
+            # jsonify() entra por aquí: entregar los bytes de orjson tal
+            # cual al response_class evita el round-trip decode→re-encode
+            # UTF-8 que pagaría la ruta dumps() heredada
+            obj = self._prepare_response_obj(args, kwargs)
+            return self._app.response_class(
+                orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS),
+                mimetype='application/json',
+            )
+except ImportError:
+    ORJSONProvider = None
+
+@lru_cache(maxsize=1)
 def create_app():
-    """Factory function to create Flask app instance"""
-    app = Flask(__name__)
-    
-    # Configuration desde variables de entorno
-    app.config['SECRET_KEY'] = os.getenv('SECRET_KEY', 'amarillo-platano')
-    app.config['DEBUG'] = os.getenv('DEBUG', 'False').lower() in ('true', '1', 'yes')
+    """
+    Factory function to create Flask app instance.
+
+    Memoizada: llamadas repetidas (fixtures de tests, loaders WSGI)
+    reciben la misma instancia en lugar de re-registrar CORS y el
+    blueprint cada vez. Usar reset_app() para forzar una app fresca.
+    """
+    # API pura: sin ruta /static/<path> (una regla menos que compilar y
+    # rutear) ni carpeta de templates (no se crea el entorno Jinja)
+    app = Flask(__name__, static_folder=None, template_folder=None)
+
+    if ORJSONProvider is not None:
+        app.json = ORJSONProvider(app)
+
+    # Configuration desde variables de entorno (constantes de módulo),
+    # volcada en un solo merge de dict en lugar de N escrituras sueltas
+    app.config.update(
+        SECRET_KEY=_SECRET,
+        DEBUG=_DEBUG,
+        # Sin sorted() por respuesta JSON: el orden de claves no le
+        # importa a esta API y el sort es O(k log k) de puro desperdicio
+        JSON_SORT_KEYS=False,
+    )
+    app.json.sort_keys = False
     
-    # Configurar CORS para permitir cualquier origen
-    CORS(app)
+    # Cortocircuito de preflights en la capa WSGI: filtro más barato
+    # primero, terminar temprano — los OPTIONS ni siquiera entran a Flask
+    app.wsgi_app = _cors_wsgi(app.wsgi_app)
+
+    # CORS para las respuestas reales: tres headers precalculados en un
+    # after_request, sin la cadena de filtros de flask_cors
+    @app.after_request
+    def _cors(response):
+        headers = response.headers
+        for clave, valor in _CORS_HEADERS:
+            headers[clave] = valor
+        return response
     
-    # Register blueprints
+    # Register blueprints (import perezoso: el grafo transitivo de vistas
+    # y analizadores es el costo dominante de importar main; solo la
+    # construcción real de la app lo paga)
+    from app.api.routes import api_bp
     app.register_blueprint(api_bp, url_prefix='/api')
-    
+
+    # Calentar el mapa de URLs: materializa las reglas y compila sus regex
+    # aquí, en el arranque, en lugar de sobre la primera petición real
+    app.url_map.update()
+    try:
+        app.url_map.bind('localhost').match('/__warmup__')
+    except Exception:
+        pass
+
     return app
 
+
+def reset_app():
+    """Descarta la app memoizada (para tests que necesitan una fresca)."""
+    create_app.cache_clear()
+
+
+# Export a nivel de módulo para loaders WSGI que esperan "main:application"
+# (p. ej. gunicorn con preload). Opt-in por env para que importar main siga
+# siendo barato en los demás contextos.
+if _GUNICORN_PRELOAD:
+    application = create_app()
+
+
 if __name__ == '__main__':
-    app = create_app()
-    
-    # Obtener configuración del servidor desde variables de entorno
-    host = os.getenv('HOST', '0.0.0.0')
-    port = int(os.getenv('PORT', 5000))
-    debug = os.getenv('DEBUG', 'False').lower() in ('true', '1', 'yes')
-    
-    app.run(host=host, port=port, debug=debug)
+    # El servidor de desarrollo de Werkzeug serializa peticiones y no es
+    # apto para producción; hay que pedirlo explícitamente. En producción
+    # usar un servidor WSGI real, p. ej.:
+    #   gunicorn -w $(nproc) -k gthread 'main:create_app()'
+    if _ALLOW_DEV_SERVER:
+        app = create_app()
+        # DEBUG se relee de la config de la app ya construida: una sola
+        # fuente de verdad entre la factory y el runner
+        app.run(host=_HOST, port=_PORT, debug=app.config['DEBUG'], threaded=True)
+    else:
+        raise SystemExit(
+            "Servidor de desarrollo deshabilitado. Usa gunicorn:\n"
+            "  gunicorn -w $(nproc) -k gthread 'main:create_app()'\n"
+            "o exporta ALLOW_DEV_SERVER=1 para desarrollo local."
+        )